@@ -1,16 +1,69 @@
 from fastapi import HTTPException
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import asyncio
 import aiohttp
-import xml.etree.ElementTree as ET
+from aiolimiter import AsyncLimiter
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+import lxml.etree as LET
 import re
 
 from config import Paper
 
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+
+    def _parse_datetime(text: str) -> datetime:
+        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+_WS_RE = re.compile(r"\s+")
+
+# Shared across all fetches so concurrent categories stay within arXiv's limits
+_RATE_LIMITER = AsyncLimiter(3, 1.0)
+
+# Atom tags in Clark notation, so lookups skip namespace prefix resolution
+_ATOM = "{http://www.w3.org/2005/Atom}"
+(
+    _ENTRY,
+    _ID,
+    _TITLE,
+    _SUMMARY,
+    _AUTHOR,
+    _NAME,
+    _CATEGORY,
+    _PUBLISHED,
+    _UPDATED,
+) = (
+    _ATOM + tag
+    for tag in (
+        "entry",
+        "id",
+        "title",
+        "summary",
+        "author",
+        "name",
+        "category",
+        "published",
+        "updated",
+    )
+)
+
 
 # ArXiv API client
 class ArXivClient:
     BASE_URL = "http://export.arxiv.org/api/query"
+    ENTRY_TAG = _ENTRY
+    CHUNK_SIZE = 65536
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Longest single wait between attempts, for both backoff and Retry-After
+    MAX_RETRY_WAIT = 30
 
     @staticmethod
     def clean_text(text: str) -> str:
@@ -18,12 +71,71 @@ class ArXivClient:
         if not text:
             return ""
         # Remove extra whitespace and newlines
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return _WS_RE.sub(" ", text).strip()
+
+    @staticmethod
+    def parse_entry(entry: LET._Element) -> Paper:
+        """Build a Paper from a single Atom <entry> element"""
+        # Extract paper ID
+        id_text = entry.findtext(_ID)
+        paper_id = id_text.split("/abs/")[-1]
+
+        # Extract title
+        title = ArXivClient.clean_text(entry.findtext(_TITLE))
+
+        # Extract abstract
+        abstract = ArXivClient.clean_text(entry.findtext(_SUMMARY))
+
+        # Extract authors
+        authors = []
+        for author in entry.iterfind(_AUTHOR):
+            name = author.findtext(_NAME)
+            if name:
+                authors.append(name)
+
+        # Extract categories
+        categories = []
+        for cat in entry.iterfind(_CATEGORY):
+            term = cat.get("term")
+            if term:
+                categories.append(term)
+
+        # Extract dates
+        published = _parse_datetime(entry.findtext(_PUBLISHED))
+        updated = _parse_datetime(entry.findtext(_UPDATED))
+
+        # Generate URLs
+        arxiv_url = f"https://arxiv.org/abs/{paper_id}"
+        pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
+
+        # Every field is built above with the right type, so skip validation
+        return Paper.model_construct(
+            id=paper_id,
+            title=title,
+            abstract=abstract,
+            authors=authors,
+            categories=categories,
+            published=published,
+            updated=updated,
+            arxiv_url=arxiv_url,
+            pdf_url=pdf_url,
+            fetched_at=datetime.utcnow(),
+            is_new=True,
+        )
 
     @staticmethod
-    async def fetch_papers(category: str, max_results: int = 50) -> List[Paper]:
-        """Fetch recent papers from a specific category"""
+    async def fetch_papers(
+        session: aiohttp.ClientSession,
+        category: str,
+        max_results: int = 50,
+        http_cache: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> List[Paper]:
+        """Fetch recent papers from a specific category
+
+        If ``http_cache`` is given, the ETag/Last-Modified validators stored
+        in it are sent with the request and refreshed from the response; an
+        unchanged feed (304) yields no papers.
+        """
         params = {
             "search_query": f"cat:{category}",
             "start": 0,
@@ -32,78 +144,81 @@ class ArXivClient:
             "sortOrder": "descending",
         }
 
-        papers = []
-        async with aiohttp.ClientSession() as session:
-            async with session.get(ArXivClient.BASE_URL, params=params) as response:
-                if response.status != 200:
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"ArXiv API error: {response.status}",
-                    )
-
-                content = await response.text()
-                root = ET.fromstring(content)
-
-                # Parse XML namespace
-                ns = {
-                    "atom": "http://www.w3.org/2005/Atom",
-                    "arxiv": "http://arxiv.org/schemas/atom",
-                }
-
-                entries = root.findall("atom:entry", ns)
-
-                for entry in entries:
-                    # Extract paper ID
-                    id_text = entry.find("atom:id", ns).text
-                    paper_id = id_text.split("/abs/")[-1]
-
-                    # Extract title
-                    title = ArXivClient.clean_text(entry.find("atom:title", ns).text)
+        cache_key = f"{category}:{max_results}"
+        cached = http_cache.get(cache_key, {}) if http_cache is not None else {}
+        headers = {}
+        if "etag" in cached:
+            headers["If-None-Match"] = cached["etag"]
+        if "last_modified" in cached:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        async for attempt in AsyncRetrying(
+            wait=wait_exponential(multiplier=1, max=ArXivClient.MAX_RETRY_WAIT),
+            stop=stop_after_attempt(5),
+            retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
+            reraise=True,
+        ):
+            with attempt:
+                papers, validators = await ArXivClient._request_feed(
+                    session, params, headers
+                )
+
+        # Only remember validators once the feed has been parsed in full
+        if http_cache is not None and validators is not None:
+            http_cache[cache_key] = validators
 
-                    # Extract abstract
-                    abstract = ArXivClient.clean_text(
-                        entry.find("atom:summary", ns).text
-                    )
-
-                    # Extract authors
-                    authors = []
-                    for author in entry.findall("atom:author", ns):
-                        name = author.find("atom:name", ns).text
-                        if name:
-                            authors.append(name)
-
-                    # Extract categories
-                    categories = []
-                    for cat in entry.findall("atom:category", ns):
-                        term = cat.get("term")
-                        if term:
-                            categories.append(term)
-
-                    # Extract dates
-                    published = datetime.fromisoformat(
-                        entry.find("atom:published", ns).text.replace("Z", "+00:00")
-                    )
-                    updated = datetime.fromisoformat(
-                        entry.find("atom:updated", ns).text.replace("Z", "+00:00")
-                    )
+        return papers
 
-                    # Generate URLs
-                    arxiv_url = f"https://arxiv.org/abs/{paper_id}"
-                    pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
-
-                    paper = Paper(
-                        id=paper_id,
-                        title=title,
-                        abstract=abstract,
-                        authors=authors,
-                        categories=categories,
-                        published=published,
-                        updated=updated,
-                        arxiv_url=arxiv_url,
-                        pdf_url=pdf_url,
-                        fetched_at=datetime.utcnow(),
-                        is_new=True,
+    @staticmethod
+    async def _request_feed(
+        session: aiohttp.ClientSession, params: dict, headers: Dict[str, str]
+    ) -> Tuple[List[Paper], Optional[Dict[str, str]]]:
+        """Request and parse one feed; validators are None for a 304 response"""
+        papers = []
+        # The feed arrives over plain HTTP, so never expand external entities
+        parser = LET.XMLPullParser(
+            events=("end",),
+            tag=ArXivClient.ENTRY_TAG,
+            resolve_entities=False,
+            no_network=True,
+        )
+        async with _RATE_LIMITER:
+            response = await session.get(
+                ArXivClient.BASE_URL, params=params, headers=headers
+            )
+        async with response:
+            if response.status == 304:
+                return [], None
+            if response.status in ArXivClient.RETRY_STATUSES:
+                # Honour Retry-After before letting the retry loop back off, but
+                # cap it: the caller holds the fetch lock while this sleeps
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    await asyncio.sleep(
+                        min(int(retry_after), ArXivClient.MAX_RETRY_WAIT)
                     )
-                    papers.append(paper)
-
-        return papers
+                response.raise_for_status()
+            if response.status != 200:
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"ArXiv API error: {response.status}",
+                )
+
+            # Parse <entry> elements as chunks arrive, freeing each once parsed
+            async for chunk in response.content.iter_chunked(ArXivClient.CHUNK_SIZE):
+                parser.feed(chunk)
+                for _, entry in parser.read_events():
+                    papers.append(ArXivClient.parse_entry(entry))
+                    entry.clear()
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
+
+            parser.close()
+
+            validators = {}
+            if "ETag" in response.headers:
+                validators["etag"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                validators["last_modified"] = response.headers["Last-Modified"]
+
+        return papers, validators
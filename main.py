@@ -1,10 +1,11 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from typing import List
+from typing import Dict, List, Tuple
 from datetime import datetime
 import asyncio
+import aiohttp
 from contextlib import asynccontextmanager
 
 from arxiv_cli import ArXivClient
@@ -12,61 +13,122 @@ from config import CategoryConfig, FetchStatus, Paper
 from storage import DataStorage
 
 
+# Maximum number of concurrent requests to the arXiv API
+FETCH_CONCURRENCY = 4
+
+# Largest page of papers a single /api/papers request may ask for
+MAX_PAPERS_PAGE = 2000
+
+
+def _describe_error(err: BaseException) -> str:
+    # HTTPException has an empty str(); its detail carries the message
+    if isinstance(err, HTTPException):
+        return str(err.detail)
+    return str(err) or type(err).__name__
+
+
+def _describe_failures(failures: Dict[str, BaseException]) -> str:
+    return "; ".join(f"{cat}: {_describe_error(err)}" for cat, err in failures.items())
+
+
+async def fetch_all_categories(
+    session: aiohttp.ClientSession, storage: DataStorage
+) -> Tuple[List[Paper], Dict[str, BaseException], Dict[str, Dict[str, str]]]:
+    """Fetch papers for all enabled categories concurrently
+
+    Returns the papers of the categories that succeeded, the error raised by
+    each category that failed and the refreshed HTTP validator cache, which the
+    caller saves once the papers themselves are stored.
+    """
+    config = storage.load_config()
+    http_cache = storage.load_http_cache()
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def one(cat_config: CategoryConfig) -> List[Paper]:
+        async with sem:
+            return await ArXivClient.fetch_papers(
+                session, cat_config.category, cat_config.max_results, http_cache
+            )
+
+    enabled = [c for c in config if c.enabled]
+    results = await asyncio.gather(*(one(c) for c in enabled), return_exceptions=True)
+
+    # Keep papers from successful categories; fail only if every category failed
+    all_papers = []
+    failures = {}
+    for cat_config, result in zip(enabled, results):
+        if isinstance(result, BaseException):
+            failures[cat_config.category] = result
+        else:
+            all_papers.extend(result)
+    if failures and len(failures) == len(results):
+        raise RuntimeError(f"All categories failed: {_describe_failures(failures)}")
+    return all_papers, failures, http_cache
+
+
+async def _do_fetch(app_state) -> FetchStatus:
+    """Fetch papers for all enabled categories and store them"""
+    # Serialize fetch cycles so overlapping runs never race on the stored files
+    async with app_state.fetch_lock:
+        all_papers, failures, http_cache = await fetch_all_categories(
+            app_state.http_session, app_state.storage
+        )
+
+        # Update storage
+        seen_ids = await asyncio.to_thread(app_state.storage.load_seen_ids)
+
+        # Papers cross-listed in several categories are only stored once
+        incoming = {p.id: p for p in all_papers}
+        new_ids = {pid for pid in incoming if pid not in seen_ids}
+        for paper_id, paper in incoming.items():
+            paper.is_new = paper_id in new_ids
+        new_count = len(new_ids)
+
+        # Disk writes grow with the store, so keep them off the event loop
+        await asyncio.to_thread(
+            app_state.storage.save_papers_incremental, list(incoming.values())
+        )
+        # seen_ids is the storage's shared filter: mark papers seen only once
+        # they are stored, so a failed save leaves them new for the next cycle
+        for paper_id in new_ids:
+            seen_ids.add(paper_id)
+        await asyncio.to_thread(app_state.storage.save_seen_ids, seen_ids)
+        # Only now can the next cycle safely skip feeds that have not changed
+        app_state.storage.save_http_cache(http_cache)
+
+        # Update status
+        message = f"Fetched {len(all_papers)} papers, {new_count} new"
+        if failures:
+            message += f" (failed categories: {_describe_failures(failures)})"
+        status = FetchStatus(
+            last_fetch=datetime.utcnow(),
+            papers_found=len(all_papers),
+            new_papers=new_count,
+            status="partial" if failures else "success",
+            message=message,
+        )
+        app_state.storage.save_status(status)
+        return status
+
+
 # Background task for periodic fetching
 async def periodic_fetch(app_state):
     """Background task to periodically fetch new papers"""
-    while app_state["auto_fetch_enabled"]:
+    while app_state.auto_fetch_enabled:
         try:
-            # Fetch papers for all enabled categories
-            all_papers = []
-            config = app_state["storage"].load_config()
-
-            for cat_config in config:
-                if cat_config.enabled:
-                    papers = await ArXivClient.fetch_papers(
-                        cat_config.category, cat_config.max_results
-                    )
-                    all_papers.extend(papers)
-
-            # Update storage
-            seen_ids = app_state["storage"].load_seen_ids()
-            existing_papers = app_state["storage"].load_papers()
-
-            new_count = 0
-            for paper in all_papers:
-                if paper.id not in seen_ids:
-                    paper.is_new = True
-                    new_count += 1
-                    seen_ids.add(paper.id)
-                else:
-                    paper.is_new = False
-                existing_papers[paper.id] = paper
-
-            app_state["storage"].save_papers(existing_papers)
-            app_state["storage"].save_seen_ids(seen_ids)
-
-            # Update status
-            status = FetchStatus(
-                last_fetch=datetime.utcnow(),
-                papers_found=len(all_papers),
-                new_papers=new_count,
-                status="success",
-                message=f"Fetched {len(all_papers)} papers, {new_count} new",
-            )
-            app_state["storage"].save_status(status)
-
+            await _do_fetch(app_state)
         except Exception as e:
             status = FetchStatus(
                 last_fetch=datetime.utcnow(),
                 papers_found=0,
                 new_papers=0,
                 status="error",
-                message=str(e),
+                message=_describe_error(e),
             )
-            app_state["storage"].save_status(status)
+            app_state.storage.save_status(status)
 
         # Wait for the specified interval (default: 1 hour)
-        await asyncio.sleep(app_state["fetch_interval"])
+        await asyncio.sleep(app_state.fetch_interval)
 
 
 # Lifespan context manager
@@ -74,12 +136,19 @@ async def periodic_fetch(app_state):
 async def lifespan(app: FastAPI):
     # Startup
     app.state.storage = DataStorage()
+    await app.state.storage.warm_papers()
     app.state.auto_fetch_enabled = True
     app.state.fetch_interval = 3600  # 1 hour in seconds
     app.state.fetch_task = None
+    app.state.fetch_lock = asyncio.Lock()
+
+    # Shared HTTP session so arXiv connections are pooled and kept alive
+    app.state.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=75)
+    )
 
     # Start background task
-    app.state.fetch_task = asyncio.create_task(periodic_fetch(app.state.__dict__))
+    app.state.fetch_task = asyncio.create_task(periodic_fetch(app.state))
 
     yield
 
@@ -92,6 +161,8 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    await app.state.http_session.close()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -99,6 +170,7 @@ app = FastAPI(
     description="Lightweight arXiv paper monitoring system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -123,64 +195,31 @@ async def root():
     return HTMLResponse(content=html_content)
 
 
-@app.get("/api/papers", response_model=List[Paper])
-async def get_papers():
-    """Get all stored papers"""
-    papers = app.state.storage.load_papers()
-    # Sort by updated date, newest first
-    sorted_papers = sorted(papers.values(), key=lambda p: p.updated, reverse=True)
-    return sorted_papers
+@app.get("/api/papers")
+async def get_papers(
+    limit: int = Query(200, ge=1, le=MAX_PAPERS_PAGE), offset: int = Query(0, ge=0)
+):
+    """Get a page of stored papers, newest first"""
+    # Stored records are already valid Paper dicts, kept sorted newest first
+    return await asyncio.to_thread(
+        app.state.storage.load_papers_sorted, limit, offset
+    )
 
 
 @app.post("/api/fetch")
 async def fetch_papers_now(background_tasks: BackgroundTasks):
     """Manually trigger paper fetching"""
     try:
-        all_papers = []
-        config = app.state.storage.load_config()
-
-        for cat_config in config:
-            if cat_config.enabled:
-                papers = await ArXivClient.fetch_papers(
-                    cat_config.category, cat_config.max_results
-                )
-                all_papers.extend(papers)
-
-        # Update storage
-        seen_ids = app.state.storage.load_seen_ids()
-        existing_papers = app.state.storage.load_papers()
-
-        new_count = 0
-        for paper in all_papers:
-            if paper.id not in seen_ids:
-                paper.is_new = True
-                new_count += 1
-                seen_ids.add(paper.id)
-            else:
-                paper.is_new = False
-            existing_papers[paper.id] = paper
-
-        app.state.storage.save_papers(existing_papers)
-        app.state.storage.save_seen_ids(seen_ids)
-
-        # Update status
-        status = FetchStatus(
-            last_fetch=datetime.utcnow(),
-            papers_found=len(all_papers),
-            new_papers=new_count,
-            status="success",
-            message=f"Fetched {len(all_papers)} papers, {new_count} new",
-        )
-        app.state.storage.save_status(status)
-
+        status = await _do_fetch(app.state)
         return {
-            "status": "success",
-            "papers_fetched": len(all_papers),
-            "new_papers": new_count,
+            "status": status.status,
+            "papers_fetched": status.papers_found,
+            "new_papers": status.new_papers,
+            "message": status.message,
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=_describe_error(e))
 
 
 @app.get("/api/status", response_model=FetchStatus)
@@ -201,15 +240,17 @@ async def get_status():
 @app.post("/api/mark-all-seen")
 async def mark_all_seen():
     """Mark all papers as seen"""
-    papers = app.state.storage.load_papers()
-    seen_ids = app.state.storage.load_seen_ids()
+    async with app.state.fetch_lock:
+        papers = await asyncio.to_thread(app.state.storage.load_papers_raw)
+        seen_ids = await asyncio.to_thread(app.state.storage.load_seen_ids)
 
-    for paper_id, paper in papers.items():
-        paper.is_new = False
-        seen_ids.add(paper_id)
+        for paper_id, paper in papers.items():
+            papers[paper_id] = {**paper, "is_new": False}
 
-    app.state.storage.save_papers(papers)
-    app.state.storage.save_seen_ids(seen_ids)
+        await asyncio.to_thread(app.state.storage.save_papers_raw, papers)
+        for paper_id in papers:
+            seen_ids.add(paper_id)
+        await asyncio.to_thread(app.state.storage.save_seen_ids, seen_ids)
 
     return {"status": "success", "message": "All papers marked as seen"}
 
@@ -221,7 +262,7 @@ async def toggle_auto_fetch():
 
     if app.state.auto_fetch_enabled and not app.state.fetch_task:
         # Restart the fetch task
-        app.state.fetch_task = asyncio.create_task(periodic_fetch(app.state.__dict__))
+        app.state.fetch_task = asyncio.create_task(periodic_fetch(app.state))
 
     return {"enabled": app.state.auto_fetch_enabled}
 
@@ -242,8 +283,11 @@ async def update_config(config: List[CategoryConfig]):
 @app.post("/api/clear")
 async def clear_all_data():
     """Clear all stored data"""
-    app.state.storage.save_papers({})
-    app.state.storage.save_seen_ids(set())
+    async with app.state.fetch_lock:
+        await asyncio.to_thread(app.state.storage.save_papers, {})
+        await asyncio.to_thread(app.state.storage.clear_seen_ids)
+        # Forget feed validators so the next fetch downloads every feed again
+        app.state.storage.save_http_cache({})
 
     # Update status
     status = FetchStatus(
@@ -1,22 +1,29 @@
+const PAGE_SIZE = 200;
+
 let currentCategory = 'all';
 let papers = [];
 let categories = new Set();
+let hasMorePapers = false;
+
+async function fetchPapersPage(offset) {
+    const response = await fetch(`/api/papers?limit=${PAGE_SIZE}&offset=${offset}`);
+    return await response.json();
+}
 
 async function loadPapers() {
     try {
-        const response = await fetch('/api/papers');
-        const data = await response.json();
-        papers = data;
-        
-        // Extract unique categories
-        categories.clear();
-        papers.forEach(paper => {
-            paper.categories.forEach(cat => categories.add(cat));
-        });
+        // Reload every page already shown so refreshes keep "load more" results
+        const wanted = Math.max(papers.length, PAGE_SIZE);
+        let loaded = [];
+        let page;
+        do {
+            page = await fetchPapersPage(loaded.length);
+            loaded = loaded.concat(page);
+        } while (page.length === PAGE_SIZE && loaded.length < wanted);
+        papers = loaded;
+        hasMorePapers = page.length === PAGE_SIZE;
         
-        updateCategoryChips();
-        displayPapers();
-        updateStatus();
+        refreshPapers();
     } catch (error) {
         console.error('Error loading papers:', error);
         document.getElementById('papersContainer').innerHTML = 
@@ -24,6 +31,33 @@ async function loadPapers() {
     }
 }
 
+async function loadMorePapers() {
+    try {
+        const page = await fetchPapersPage(papers.length);
+        papers = papers.concat(page);
+        hasMorePapers = page.length === PAGE_SIZE;
+        
+        refreshPapers();
+    } catch (error) {
+        console.error('Error loading more papers:', error);
+    }
+}
+
+function refreshPapers() {
+    // Extract unique categories
+    categories.clear();
+    papers.forEach(paper => {
+        paper.categories.forEach(cat => categories.add(cat));
+    });
+    
+    updateCategoryChips();
+    displayPapers();
+    updateStatus();
+    
+    // Older papers stay on the server until the next page is requested
+    document.getElementById('loadMoreBtn').style.display = hasMorePapers ? '' : 'none';
+}
+
 function updateCategoryChips() {
     const container = document.getElementById('categoryChips');
     let html = '<div class="chip active" onclick="filterByCategory(\'all\')">All</div>';
@@ -158,7 +192,8 @@ async function updateStatus() {
         document.getElementById('fetchStatus').textContent = status.status || 'Ready';
         document.getElementById('lastFetch').textContent = 
             status.last_fetch ? new Date(status.last_fetch).toLocaleString() : 'Never';
-        document.getElementById('paperCount').textContent = papers.length;
+        document.getElementById('paperCount').textContent = 
+            papers.length + (hasMorePapers ? '+' : '');
         document.getElementById('newCount').textContent = papers.filter(p => p.is_new).length;
     } catch (error) {
         console.error('Error updating status:', error);
@@ -1,65 +1,311 @@
-from typing import List, Optional, Dict, Set
-import json
+from typing import List, Optional, Dict, Iterable, Tuple
+import asyncio
+import gzip
+import os
+import threading
+import zlib
+import orjson
+from operator import itemgetter
+from pybloom_live import ScalableBloomFilter
+from sortedcontainers import SortedKeyList
 from pathlib import Path
 
 from config import Paper, CategoryConfig, FetchStatus
 
+# Compact a papers shard once it holds this many records per unique paper
+COMPACT_RATIO = 2
+
+# Sizing of the Bloom filter that records which paper ids have been seen
+SEEN_INITIAL_CAPACITY = 100_000
+SEEN_ERROR_RATE = 1e-6
+
+# Stored timestamps are ISO-8601 UTC strings, so they sort chronologically
+_UPDATED_KEY = itemgetter('updated')
+
 
 # Storage class for persistent data
 class DataStorage:
     def __init__(self, base_dir: str = "./arxiv_data"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
-        self.papers_file = self.base_dir / "papers.json"
-        self.seen_file = self.base_dir / "seen_ids.json"
+        self.papers_dir = self.base_dir / "papers"
+        # Single-file papers stores written by older versions, oldest format first
+        self.legacy_papers_json = self.base_dir / "papers.json"
+        self.legacy_papers_files = (
+            self.base_dir / "papers.jsonl",
+            self.base_dir / "papers.jsonl.gz",
+        )
+        self.seen_file = self.base_dir / "seen.bloom"
+        self.legacy_seen_file = self.base_dir / "seen_ids.json"
         self.config_file = self.base_dir / "config.json"
         self.status_file = self.base_dir / "status.json"
+        self.http_cache_file = self.base_dir / "cache.json"
         
-    def load_papers(self) -> Dict[str, Paper]:
-        if self.papers_file.exists():
-            with open(self.papers_file, 'r') as f:
-                data = json.load(f)
-                return {k: Paper(**v) for k, v in data.items()}
-        return {}
+        # In-memory copies of the files above; this process is the only writer,
+        # so they are filled on first load and kept current by the save methods
+        self._papers_cache: Optional[Dict[str, dict]] = None
+        self._shards: Dict[str, Dict[str, dict]] = {}
+        self._shard_lines: Dict[str, int] = {}
+        self._sorted_papers: Optional[SortedKeyList] = None
+        # Papers are loaded and saved from worker threads as well as the event loop
+        self._papers_lock = threading.RLock()
+        self._seen_cache: Optional[ScalableBloomFilter] = None
+        self._config_cache: Optional[List[CategoryConfig]] = None
+        self._status_cache: Optional[FetchStatus] = None
+        self._http_cache: Optional[Dict[str, Dict[str, str]]] = None
+        
+    def _shard_file(self, month: str) -> Path:
+        return self.papers_dir / f"{month}.jsonl.gz"
+    
+    @staticmethod
+    def _group_by_shard(records: Iterable[dict]) -> Dict[str, Dict[str, dict]]:
+        # Shard by publication month: it never changes, so a paper stays in one shard
+        shards: Dict[str, Dict[str, dict]] = {}
+        for record in records:
+            shards.setdefault(record['published'][:7], {})[record['id']] = record
+        return shards
+    
+    @staticmethod
+    def _read_log(path: Path) -> Tuple[Dict[str, dict], int, bool]:
+        """Records in one papers log, its record count and whether its tail is torn"""
+        papers = {}
+        lines = 0
+        torn = False
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rb') as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        data = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        torn = True
+                        continue
+                    # Later records for the same paper supersede earlier ones
+                    papers[data['id']] = data
+                    lines += 1
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                # A crash mid-append can leave a truncated or corrupt gzip
+                # member at the end; keep the records read before it
+                torn = True
+        return papers, lines, torn
+    
+    def _shard_paths(self) -> List[Path]:
+        # Legacy files are deleted only after migrating, so any that remain
+        # mean an earlier migration was interrupted and must be redone
+        legacy_files = (self.legacy_papers_json, *self.legacy_papers_files)
+        if any(legacy_file.exists() for legacy_file in legacy_files):
+            self._migrate_legacy_papers()
+        self.papers_dir.mkdir(exist_ok=True)
+        return sorted(self.papers_dir.glob('*.jsonl.gz'))
+    
+    def _migrate_legacy_papers(self):
+        # Split a single-file papers store from older versions into shards
+        papers = {}
+        if self.legacy_papers_json.exists():
+            with open(self.legacy_papers_json, 'rb') as f:
+                papers.update(orjson.loads(f.read()))
+        for legacy_file in self.legacy_papers_files:
+            if legacy_file.exists():
+                papers.update(self._read_log(legacy_file)[0])
+        # Older versions wrote timestamps in other formats (str() used a space
+        # separator), so re-serialize every record the way current saves do
+        papers = {k: Paper(**v).model_dump(mode='json') for k, v in papers.items()}
+        # Shards left by an interrupted migration are at least as new as the
+        # legacy records, so merge them over the top instead of overwriting them
+        self.papers_dir.mkdir(exist_ok=True)
+        for path in sorted(self.papers_dir.glob('*.jsonl.gz')):
+            papers.update(self._read_log(path)[0])
+        for month, records in self._group_by_shard(papers.values()).items():
+            self._rewrite_shard(month, records)
+        self.legacy_papers_json.unlink(missing_ok=True)
+        for legacy_file in self.legacy_papers_files:
+            legacy_file.unlink(missing_ok=True)
+    
+    def _merge_shards(
+        self, paths: List[Path], logs: Iterable[Tuple[Dict[str, dict], int, bool]]
+    ) -> Dict[str, dict]:
+        papers = {}
+        self._shards = {}
+        self._shard_lines = {}
+        for path, (records, lines, torn) in zip(paths, logs):
+            month = path.name[:-len('.jsonl.gz')]
+            self._shards[month] = records
+            self._shard_lines[month] = lines
+            if torn:
+                self._rewrite_shard(month, records)
+            papers.update(records)
+        return papers
+    
+    def _read_papers(self) -> Dict[str, dict]:
+        paths = self._shard_paths()
+        return self._merge_shards(paths, (self._read_log(p) for p in paths))
+    
+    async def warm_papers(self):
+        """Fill the papers cache, reading the shards in parallel threads"""
+        paths = await asyncio.to_thread(self._shard_paths)
+        logs = await asyncio.gather(
+            *(asyncio.to_thread(self._read_log, p) for p in paths)
+        )
+        with self._papers_lock:
+            if self._papers_cache is None:
+                self._papers_cache = self._merge_shards(paths, logs)
+    
+    def _rewrite_shard(self, month: str, records: Dict[str, dict]):
+        # Write to a temporary file first so a crash never leaves a partial shard
+        shard_file = self._shard_file(month)
+        tmp_file = shard_file.with_suffix('.tmp')
+        with gzip.open(tmp_file, 'wb', compresslevel=1) as f:
+            for record in records.values():
+                f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        os.replace(tmp_file, shard_file)
+        self._shard_lines[month] = len(records)
+    
+    def load_papers_raw(self) -> Dict[str, dict]:
+        """Stored papers as unvalidated JSON-ready dicts"""
+        with self._papers_lock:
+            if self._papers_cache is None:
+                self._papers_cache = self._read_papers()
+            return dict(self._papers_cache)
+    
+    def load_papers_sorted(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> List[dict]:
+        """Stored papers as raw dicts, most recently updated first"""
+        with self._papers_lock:
+            if self._sorted_papers is None:
+                self._sorted_papers = SortedKeyList(
+                    self.load_papers_raw().values(), key=_UPDATED_KEY
+                )
+            # The index is sorted oldest first, so map the page onto its tail
+            stop = max(len(self._sorted_papers) - offset, 0)
+            start = 0 if limit is None else max(stop - limit, 0)
+            return list(self._sorted_papers.islice(start, stop, reverse=True))
+    
+    def save_papers_raw(self, papers: Dict[str, dict]):
+        """Rewrite every papers shard with one record per paper"""
+        with self._papers_lock:
+            shards = self._group_by_shard(papers.values())
+            for path in self._shard_paths():
+                if path.name[:-len('.jsonl.gz')] not in shards:
+                    path.unlink()
+            self._shard_lines = {}
+            for month, records in shards.items():
+                self._rewrite_shard(month, records)
+            self._shards = shards
+            self._papers_cache = dict(papers)
+            self._sorted_papers = None
     
     def save_papers(self, papers: Dict[str, Paper]):
-        with open(self.papers_file, 'w') as f:
-            data = {k: v.dict() for k, v in papers.items()}
-            json.dump(data, f, default=str, indent=2)
+        self.save_papers_raw({k: v.model_dump(mode='json') for k, v in papers.items()})
     
-    def load_seen_ids(self) -> Set[str]:
-        if self.seen_file.exists():
-            with open(self.seen_file, 'r') as f:
-                return set(json.load(f))
-        return set()
+    def save_papers_incremental(self, papers: Iterable[Paper]):
+        """Append new or updated papers to the shards they belong to"""
+        with self._papers_lock:
+            if self._papers_cache is None:
+                self._papers_cache = self._read_papers()
+            records = (paper.model_dump(mode='json') for paper in papers)
+            for month, shard_records in self._group_by_shard(records).items():
+                # Each append adds a gzip member; readers decompress them as one stream
+                with gzip.open(self._shard_file(month), 'ab', compresslevel=1) as f:
+                    for record in shard_records.values():
+                        f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+                shard = self._shards.setdefault(month, {})
+                for paper_id, record in shard_records.items():
+                    previous = self._papers_cache.get(paper_id)
+                    shard[paper_id] = record
+                    self._papers_cache[paper_id] = record
+                    if self._sorted_papers is not None:
+                        if previous is not None:
+                            self._sorted_papers.discard(previous)
+                        self._sorted_papers.add(record)
+                self._shard_lines[month] = (
+                    self._shard_lines.get(month, 0) + len(shard_records)
+                )
+                if self._shard_lines[month] > COMPACT_RATIO * len(shard):
+                    self._rewrite_shard(month, shard)
     
-    def save_seen_ids(self, seen_ids: Set[str]):
-        with open(self.seen_file, 'w') as f:
-            json.dump(list(seen_ids), f)
+    @staticmethod
+    def new_seen_filter() -> ScalableBloomFilter:
+        return ScalableBloomFilter(
+            initial_capacity=SEEN_INITIAL_CAPACITY, error_rate=SEEN_ERROR_RATE
+        )
+    
+    def load_seen_ids(self) -> ScalableBloomFilter:
+        """The cached seen-id filter itself, not a copy"""
+        # Copying grows with the filter, so callers add ids only once their
+        # papers have been saved
+        if self._seen_cache is None:
+            if self.seen_file.exists():
+                with open(self.seen_file, 'rb') as f:
+                    self._seen_cache = ScalableBloomFilter.fromfile(f)
+            else:
+                self._seen_cache = self.new_seen_filter()
+                # Carry over ids recorded by the older JSON list format
+                if self.legacy_seen_file.exists():
+                    with open(self.legacy_seen_file, 'rb') as f:
+                        for paper_id in orjson.loads(f.read()):
+                            self._seen_cache.add(paper_id)
+                    self.save_seen_ids(self._seen_cache)
+        return self._seen_cache
+    
+    def save_seen_ids(self, seen_ids: ScalableBloomFilter):
+        # Write to a temporary file first so a crash never leaves a partial filter
+        tmp_file = self.seen_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            seen_ids.tofile(f)
+        os.replace(tmp_file, self.seen_file)
+        self._seen_cache = seen_ids
+        # The filter now holds every id the older JSON list did
+        self.legacy_seen_file.unlink(missing_ok=True)
+    
+    def clear_seen_ids(self):
+        self.save_seen_ids(self.new_seen_filter())
     
     def load_config(self) -> List[CategoryConfig]:
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                data = json.load(f)
-                return [CategoryConfig(**item) for item in data]
-        # Default categories
-        return [
-            CategoryConfig(category="cs.CV", enabled=True),
-            CategoryConfig(category="cs.LG", enabled=True),
-            CategoryConfig(category="cs.AI", enabled=True),
-        ]
+        if self._config_cache is None:
+            if self.config_file.exists():
+                with open(self.config_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                    self._config_cache = [CategoryConfig(**item) for item in data]
+            else:
+                # Default categories
+                self._config_cache = [
+                    CategoryConfig(category="cs.CV", enabled=True),
+                    CategoryConfig(category="cs.LG", enabled=True),
+                    CategoryConfig(category="cs.AI", enabled=True),
+                ]
+        return list(self._config_cache)
     
     def save_config(self, config: List[CategoryConfig]):
-        with open(self.config_file, 'w') as f:
-            json.dump([c.dict() for c in config], f, indent=2)
+        with open(self.config_file, 'wb') as f:
+            data = [c.model_dump() for c in config]
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        self._config_cache = list(config)
     
     def load_status(self) -> Optional[FetchStatus]:
-        if self.status_file.exists():
-            with open(self.status_file, 'r') as f:
-                data = json.load(f)
-                return FetchStatus(**data)
-        return None
+        if self._status_cache is None and self.status_file.exists():
+            with open(self.status_file, 'rb') as f:
+                data = orjson.loads(f.read())
+                self._status_cache = FetchStatus(**data)
+        return self._status_cache
     
     def save_status(self, status: FetchStatus):
-        with open(self.status_file, 'w') as f:
-            json.dump(status.dict(), f, default=str, indent=2)
\ No newline at end of file
+        with open(self.status_file, 'wb') as f:
+            f.write(orjson.dumps(status.model_dump(), option=orjson.OPT_INDENT_2))
+        self._status_cache = status
+    
+    def load_http_cache(self) -> Dict[str, Dict[str, str]]:
+        """HTTP validators (ETag/Last-Modified) of the last feed per category"""
+        if self._http_cache is None:
+            self._http_cache = {}
+            if self.http_cache_file.exists():
+                with open(self.http_cache_file, 'rb') as f:
+                    self._http_cache = orjson.loads(f.read())
+        return dict(self._http_cache)
+    
+    def save_http_cache(self, http_cache: Dict[str, Dict[str, str]]):
+        with open(self.http_cache_file, 'wb') as f:
+            f.write(orjson.dumps(http_cache, option=orjson.OPT_INDENT_2))
+        self._http_cache = dict(http_cache)
\ No newline at end of file